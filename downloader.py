@@ -14,13 +14,35 @@ it downloads all referenced assets into ./data, preserving folder structure wher
 
 import sys
 import os
+import atexit
+import threading
+import functools
+import mimetypes
+import shutil
 import re
 import urllib.parse as urlparse
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import json
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
 try:
     import gdown
 except ImportError:
@@ -31,6 +53,24 @@ from gdown.exceptions import FileURLRetrievalError, FolderContentsMaximumLimitEr
 
 FAILED_LOG = Path("failed_downloads_google.txt")
 
+# Filename from a Content-Disposition header.
+_FILENAME_RE = re.compile(r'filename\*?="?([^";]+)"?')
+# uc?id=... URL from gdown's FileURLRetrievalError text.
+_BROWSER_URL_RE = re.compile(r"https?://drive\.google\.com/uc\?[^ \n]+")
+
+# Read size for streamed downloads; most assets are multi-MB PDFs/zips/videos.
+CHUNK = 1 << 18  # 256 KiB
+
+# Sent with file downloads. PDFs/zips/videos barely compress, and an
+# unencoded body has a real Content-Length and byte offsets that Range
+# requests can resume from.
+BINARY_HEADERS = {"Accept-Encoding": "identity"}
+
+# Number of files downloaded in parallel. Scraped links and the entries of
+# every Drive folder being fetched all share the same MAX_WORKERS slots.
+MAX_WORKERS = 8
+_download_slots = threading.BoundedSemaphore(MAX_WORKERS)
+
 # ----------------- Helpers -----------------
 
 def ensure_data_dir() -> Path:
@@ -39,16 +79,45 @@ def ensure_data_dir() -> Path:
     return data_dir
 
 
-def is_google_drive_url(url: str) -> bool:
-    parsed = urlparse.urlparse(url)
+@functools.lru_cache(maxsize=1024)
+def parse_url(url: str) -> urlparse.ParseResult:
+    """
+    Memoized urlparse. A link is parsed by several helpers on its way through
+    process_url; ParseResult is an immutable tuple, so sharing it is safe.
+    """
+    return urlparse.urlparse(url)
+
+
+def as_parsed(url: str | urlparse.ParseResult) -> urlparse.ParseResult:
+    """
+    Accept either a raw URL or one already run through urlparse, so callers
+    classifying the same link several times only parse it once.
+    """
+    return parse_url(url) if isinstance(url, str) else url
+
+
+def is_google_drive_url(url: str | urlparse.ParseResult) -> bool:
+    parsed = as_parsed(url)
     return "drive.google.com" in (parsed.netloc or "")
 
 
-def is_dropbox_url(url: str) -> bool:
-    parsed = urlparse.urlparse(url)
+def is_google_drive_folder_url(url: str | urlparse.ParseResult) -> bool:
+    parsed = as_parsed(url)
+    return "/folders/" in (parsed.path or "")
+
+
+def is_dropbox_url(url: str | urlparse.ParseResult) -> bool:
+    parsed = as_parsed(url)
     return "dropbox.com" in (parsed.netloc or "")
 
 
+# One connection pool shared by every session, so keep-alive connections
+# to the same host are reused across downloads and worker threads.
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+
+_local = threading.local()
+
+
 def get_session() -> requests.Session:
     s = requests.Session()
     s.headers.update({
@@ -56,13 +125,28 @@ def get_session() -> requests.Session:
             "Mozilla/5.0 (X11; Linux x86_64) "
             "AppleWebKit/537.36 (KHTML, like Gecko) "
             "Chrome/129.0 Safari/537.36"
-        )
+        ),
+        # Mainly for scraped HTML pages; only offer br if we can decode it.
+        "Accept-Encoding": "gzip, deflate, br" if brotli is not None else "gzip, deflate",
     })
+    s.mount("http://", _ADAPTER)
+    s.mount("https://", _ADAPTER)
+    return s
+
+
+def default_session() -> requests.Session:
+    """
+    Session reused by every download on the current thread. Sessions aren't
+    safe to share between threads, but they all draw from the same pool.
+    """
+    s = getattr(_local, "session", None)
+    if s is None:
+        s = _local.session = get_session()
     return s
 
 
 def safe_filename_from_url(url: str, fallback: str = "download") -> str:
-    parsed = urlparse.urlparse(url)
+    parsed = parse_url(url)
     path = parsed.path
     name = os.path.basename(path.rstrip("/"))
     return name or fallback
@@ -73,7 +157,7 @@ def make_local_path_for_generic(url: str, base_dir: Path) -> Path:
     Create a local path that roughly mirrors the domain + path structure.
     e.g. https://example.com/docs/a/b.pdf -> data/example.com/docs/a/b.pdf
     """
-    parsed = urlparse.urlparse(url)
+    parsed = parse_url(url)
     netloc = parsed.netloc.replace(":", "_")
     path = parsed.path.lstrip("/") or "index"
     # Make sure we have some filename at the end
@@ -83,30 +167,223 @@ def make_local_path_for_generic(url: str, base_dir: Path) -> Path:
     return base_dir / rel
 
 
-def download_generic_file(url: str, out_dir: Path) -> None:
+_path_locks: dict[Path, threading.Lock] = {}
+_path_locks_guard = threading.Lock()
+
+
+def path_lock(path: Path) -> threading.Lock:
+    """
+    Lock giving one download at a time ownership of path and its .part, for
+    links that resolve to the same local file while running concurrently.
+    """
+    key = Path(path).resolve()
+    with _path_locks_guard:
+        return _path_locks.setdefault(key, threading.Lock())
+
+
+# URL -> {"etag", "last_modified", "size", "path", "partial"} from earlier
+# runs, used to send conditional GETs so unchanged files aren't downloaded
+# again. Partial entries describe an unfinished .part and feed If-Range.
+CACHE_INDEX = Path("data") / ".cache_index.json"
+
+_cache_lock = threading.Lock()
+_cache_index: dict[str, dict] | None = None
+
+
+def _load_cache_index() -> dict[str, dict]:
+    global _cache_index
+    if _cache_index is None:
+        try:
+            _cache_index = json.loads(CACHE_INDEX.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            _cache_index = {}
+    return _cache_index
+
+
+def conditional_headers(url: str) -> dict[str, str]:
+    """
+    If-None-Match / If-Modified-Since headers for url, provided the file we
+    saved for it last time is still on disk.
+    """
+    with _cache_lock:
+        entry = _load_cache_index().get(url)
+    if not entry or entry.get("partial") or not Path(entry["path"]).exists():
+        return {}
+
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def cached_path(url: str) -> Path | None:
+    with _cache_lock:
+        entry = _load_cache_index().get(url)
+    return Path(entry["path"]) if entry else None
+
+
+def range_validator(url: str, part_path: Path) -> str | None:
+    """
+    If-Range value for resuming part_path: the validator of the response it
+    was started from, so a changed remote file comes back as a full 200.
+    Weak ETags aren't allowed in If-Range; use Last-Modified instead.
+    """
+    with _cache_lock:
+        entry = _load_cache_index().get(url)
+    if not entry or not entry.get("partial") or entry["path"] != str(part_path):
+        return None
+    etag = entry.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return entry.get("last_modified")
+
+
+def record_cache_entry(url: str, r: requests.Response, local_path: Path, partial: bool = False) -> None:
+    """
+    Remember the validators of a 200 response for the next run. With
+    partial=True, local_path is a .part still being written.
+    """
+    etag = r.headers.get("ETag")
+    last_modified = r.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return
+
+    with _cache_lock:
+        index = _load_cache_index()
+        index[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": local_path.stat().st_size,
+            "path": str(local_path),
+            "partial": partial,
+        }
+        _save_cache_index(index)
+
+
+def finish_partial_cache_entry(url: str, part_path: Path, local_path: Path) -> None:
+    """
+    Point the partial entry for part_path at the finished file it became.
+    """
+    with _cache_lock:
+        index = _load_cache_index()
+        entry = index.get(url)
+        if not entry or not entry.get("partial") or entry["path"] != str(part_path):
+            return
+        entry.update(path=str(local_path), size=local_path.stat().st_size, partial=False)
+        _save_cache_index(index)
+
+
+def _save_cache_index(index: dict[str, dict]) -> None:
+    # Caller holds _cache_lock.
+    CACHE_INDEX.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE_INDEX.with_suffix(".tmp")
+    tmp.write_text(json.dumps(index, indent=2), encoding="utf-8")
+    os.replace(tmp, CACHE_INDEX)
+
+
+def remote_size(url: str, session: requests.Session) -> int | None:
+    """
+    Size in bytes of the file at url: Content-Length from a HEAD, or the
+    total from Content-Range of a one-byte GET for servers that reject HEAD.
+    None if the server won't say.
+    """
+    try:
+        head = session.head(url, allow_redirects=True, timeout=30, headers=BINARY_HEADERS)
+        if head.ok and "Content-Length" in head.headers:
+            return int(head.headers["Content-Length"])
+
+        headers = {**BINARY_HEADERS, "Range": "bytes=0-0"}
+        with session.get(url, stream=True, timeout=30, headers=headers) as r:
+            if r.status_code == 206:
+                # e.g. "bytes 0-0/1234567"
+                total = r.headers.get("Content-Range", "").rpartition("/")[2]
+                if total.isdigit():
+                    return int(total)
+    except (requests.RequestException, ValueError):
+        pass
+    return None
+
+
+def download_generic_file(url: str, out_dir: Path, session: requests.Session | None = None) -> None:
     """
     Download any non-GDrive/non-Dropbox file, saving under out_dir
     mirroring domain/path structure.
     """
-    session = get_session()
+    session = session or default_session()
     local_path = make_local_path_for_generic(url, out_dir)
     local_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Different links (?dl=1, other query strings) can map to the same file;
+    # only one of them may own its .part at a time.
+    with path_lock(local_path):
+        _download_generic_to(url, local_path, session)
+
+
+def _download_generic_to(url: str, local_path: Path, session: requests.Session) -> None:
+    # Bytes land in a .part file first; if an earlier run was interrupted,
+    # ask the server for just the missing suffix.
+    part_path = local_path.with_suffix(local_path.suffix + ".part")
+    offset = part_path.stat().st_size if part_path.exists() else 0
+
+    if offset:
+        headers = {**BINARY_HEADERS, "Range": f"bytes={offset}-"}
+        validator = range_validator(url, part_path)
+        if validator:
+            headers["If-Range"] = validator
+    else:
+        conditional = conditional_headers(url)
+        # A copy from an earlier run we have no validators for: skip it if
+        # the sizes still match. With validators, the conditional GET decides.
+        if not conditional and local_path.exists():
+            if remote_size(url, session) == local_path.stat().st_size:
+                print(f"[cached] {url} -> {local_path}")
+                return
+        headers = {**BINARY_HEADERS, **conditional}
+
     print(f"[generic] Downloading {url} -> {local_path}")
-    with session.get(url, stream=True, timeout=120) as r:
+    with session.get(url, stream=True, timeout=120, headers=headers) as r:
+        if r.status_code == 304:
+            print(f"[generic] Not modified, keeping {local_path}")
+            return
+        if r.status_code == 416:
+            # "bytes */N": if N is our offset, the .part is already complete
+            # (interrupted before the rename); otherwise it's stale.
+            total = r.headers.get("Content-Range", "").rpartition("/")[2]
+            if total.isdigit() and int(total) == offset:
+                print(f"[generic] Partial download already complete: {part_path}")
+                os.replace(part_path, local_path)
+                finish_partial_cache_entry(url, part_path, local_path)
+                return
+            print(f"[generic] Stale partial download, restarting {part_path}")
+            part_path.unlink()
+            return _download_generic_to(url, local_path, session)
         r.raise_for_status()
-        with open(local_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
 
+        if r.status_code == 206:
+            print(f"[generic] Resuming at byte {offset}")
+            mode = "ab"
+        else:
+            mode = "wb"  # server ignored Range; take the whole body
+        r.raw.decode_content = True  # undo gzip etc. like iter_content would
+        with open(part_path, mode) as f:
+            if mode == "wb":
+                # Validators for If-Range, should this transfer be interrupted.
+                record_cache_entry(url, r, part_path, partial=True)
+            shutil.copyfileobj(r.raw, f, length=CHUNK)
+
+        os.replace(part_path, local_path)
+        record_cache_entry(url, r, local_path)
+        finish_partial_cache_entry(url, part_path, local_path)
 
-def download_dropbox_file(url: str, out_dir: Path) -> None:
+
+def download_dropbox_file(url: str, out_dir: Path, session: requests.Session | None = None) -> None:
     """
     Download a Dropbox shared link.
     If it's a typical ?dl=0 link, switch to ?dl=1 for direct download.
     """
-    parsed = urlparse.urlparse(url)
+    parsed = parse_url(url)
     query = dict(urlparse.parse_qsl(parsed.query))
     # Force direct download
     query["dl"] = "1"
@@ -115,14 +392,18 @@ def download_dropbox_file(url: str, out_dir: Path) -> None:
         parsed._replace(query=urlparse.urlencode(query))
     )
 
-    session = get_session()
+    session = session or default_session()
     print(f"[dropbox] Downloading {direct_url}")
 
-    with session.get(direct_url, stream=True, timeout=300) as r:
+    headers = {**BINARY_HEADERS, **conditional_headers(direct_url)}
+    with session.get(direct_url, stream=True, timeout=300, headers=headers) as r:
+        if r.status_code == 304:
+            print(f"[dropbox] Not modified, keeping {cached_path(direct_url)}")
+            return
         r.raise_for_status()
 
         cd = r.headers.get("Content-Disposition", "")
-        filename_match = re.search(r'filename\*?="?([^";]+)"?', cd)
+        filename_match = _FILENAME_RE.search(cd)
         if filename_match:
             filename = filename_match.group(1)
         else:
@@ -132,59 +413,74 @@ def download_dropbox_file(url: str, out_dir: Path) -> None:
         local_path.parent.mkdir(parents=True, exist_ok=True)
 
         print(f"[dropbox] -> {local_path}")
-        with open(local_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+        r.raw.decode_content = True
+        # Two links can name the same file; write privately and rename, one
+        # download at a time per path, so bodies never interleave.
+        part_path = local_path.with_name(local_path.name + ".part")
+        with path_lock(local_path):
+            with open(part_path, "wb") as f:
+                shutil.copyfileobj(r.raw, f, length=CHUNK)
+            os.replace(part_path, local_path)
+        record_cache_entry(direct_url, r, local_path)
 
 # Log lives in the repo root; change to Path("data") / "failed_downloads_google.txt" if you prefer.
 FAILED_LOG = Path("failed_downloads_google.txt")
 
+_fail_lock = threading.Lock()
+_fail_fh = None
+
 
 def log_failed_google_download(from_url: str | None, to_path: Path | None, reason: str) -> None:
     """
     Append a line to failed_downloads_google.txt with:
         URL<TAB>LOCAL_PATH<TAB>REASON
     """
+    global _fail_fh
     url_str = from_url or "UNKNOWN_URL"
     path_str = str(to_path) if to_path is not None else "UNKNOWN_PATH"
     line = f"{url_str}\t{path_str}\t{reason}\n"
-    FAILED_LOG.parent.mkdir(parents=True, exist_ok=True)
-    with FAILED_LOG.open("a", encoding="utf-8") as f:
-        f.write(line)
+    with _fail_lock:
+        if _fail_fh is None:
+            # Opened once and kept for the whole run; line-buffered so each
+            # entry still reaches disk as soon as it's logged.
+            FAILED_LOG.parent.mkdir(parents=True, exist_ok=True)
+            _fail_fh = FAILED_LOG.open("a", encoding="utf-8", buffering=1)
+            atexit.register(_fail_fh.close)
+        _fail_fh.write(line)
+
+
+_EXT_MAP = {
+    "image/jpeg": ".jpg",   # fine for .jpeg as well
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "application/pdf": ".pdf",
+    "text/plain": ".txt",
+}
+
+
+@functools.lru_cache(maxsize=64)
+def guess_extension_from_content_type(content_type: str) -> str:
+    primary = content_type.split(";", 1)[0].strip().lower()
+    return _EXT_MAP.get(primary) or mimetypes.guess_extension(primary) or ""
 
 
-def guess_extension_from_content_type(content_type: str) -> str:
-    ct = content_type.lower()
-    if "image/jpeg" in ct:
-        return ".jpg"   # fine for .jpeg as well
-    if "image/png" in ct:
-        return ".png"
-    if "image/gif" in ct:
-        return ".gif"
-    if "application/pdf" in ct:
-        return ".pdf"
-    if "text/plain" in ct:
-        return ".txt"
-    return ""
-
-
-def download_file_direct_to_path(from_url: str, to_path: Path) -> None:
+def download_file_direct_to_path(from_url: str, to_path: Path, session: requests.Session | None = None) -> None:
     """
     Fallback: download a Google Drive 'uc?id=...' URL directly to an explicit path.
     """
     to_path = Path(to_path)
     to_path.parent.mkdir(parents=True, exist_ok=True)
 
-    parsed = urlparse.urlparse(from_url)
+    parsed = parse_url(from_url)
     query = dict(urlparse.parse_qsl(parsed.query))
     query.setdefault("export", "download")
     direct_url = urlparse.urlunparse(
         parsed._replace(query=urlparse.urlencode(query))
     )
 
+    session = session or default_session()
     print(f"[fallback] Direct GET for {direct_url}")
-    with requests.get(direct_url, stream=True, timeout=120) as r:
+    with session.get(direct_url, stream=True, timeout=120, headers=BINARY_HEADERS) as r:
         r.raise_for_status()
         content_type = r.headers.get("Content-Type", "").lower()
 
@@ -194,13 +490,18 @@ def download_file_direct_to_path(from_url: str, to_path: Path) -> None:
             log_failed_google_download(direct_url, to_path, reason)
 
         print(f"[fallback] -> {to_path}")
-        with open(to_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-
-
-def download_file_direct_guess_name(from_url: str, out_dir: Path) -> Path:
+        r.raw.decode_content = True
+        # Write beside the target and rename into place: same directory, so
+        # the rename is atomic and no bytes are copied again, and an
+        # interrupted transfer never looks like a finished file.
+        part_path = to_path.with_name(to_path.name + ".part")
+        with path_lock(to_path):
+            with open(part_path, "wb") as f:
+                shutil.copyfileobj(r.raw, f, length=CHUNK)
+            os.replace(part_path, to_path)
+
+
+def download_file_direct_guess_name(from_url: str, out_dir: Path, session: requests.Session | None = None) -> Path:
     """
     Fallback when we *don't* know the intended filename/path.
     We:
@@ -212,7 +513,7 @@ def download_file_direct_guess_name(from_url: str, out_dir: Path) -> Path:
     out_dir = Path(out_dir)
     out_dir.mkdir(exist_ok=True, parents=True)
 
-    parsed = urlparse.urlparse(from_url)
+    parsed = parse_url(from_url)
     query = dict(urlparse.parse_qsl(parsed.query))
     file_id = query.get("id", "unknown_id")
 
@@ -221,14 +522,15 @@ def download_file_direct_guess_name(from_url: str, out_dir: Path) -> Path:
         parsed._replace(query=urlparse.urlencode(query))
     )
 
+    session = session or default_session()
     print(f"[fallback] Direct GET (guess name) for {direct_url}")
-    with requests.get(direct_url, stream=True, timeout=120) as r:
+    with session.get(direct_url, stream=True, timeout=120, headers=BINARY_HEADERS) as r:
         r.raise_for_status()
         content_type = r.headers.get("Content-Type", "").lower()
         cd = r.headers.get("Content-Disposition", "")
 
         filename = None
-        m = re.search(r'filename\*?="?([^";]+)"?', cd)
+        m = _FILENAME_RE.search(cd)
         if m:
             filename = m.group(1)
 
@@ -246,10 +548,12 @@ def download_file_direct_guess_name(from_url: str, out_dir: Path) -> Path:
             log_failed_google_download(direct_url, to_path, reason)
 
         print(f"[fallback] -> {to_path}")
-        with open(to_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+        r.raw.decode_content = True
+        part_path = to_path.with_name(to_path.name + ".part")
+        with path_lock(to_path):
+            with open(part_path, "wb") as f:
+                shutil.copyfileobj(r.raw, f, length=CHUNK)
+            os.replace(part_path, to_path)
 
     return to_path
 
@@ -258,11 +562,9 @@ def download_google_drive(url: str, out_dir: Path) -> None:
     """
     Use gdown to download from Google Drive.
 
-    - If it's a folder, we call gdown.download_folder in a loop.
-    On each FileURLRetrievalError, we:
-        * parse the offending uc?id=... URL from the error message
-        * download it ourselves with requests
-        * then retry gdown with resume=True until no more errors occur
+    - If it's a folder, we list it with gdown.download_folder(skip_download=True)
+    and download the files in parallel. For each file, gdown goes first; if
+    that fails we download it ourselves with requests.
     - If it's a single file, we just use gdown.download once.
 
     Any files we *still* can't grab are logged to failed_downloads_google.txt.
@@ -272,29 +574,27 @@ def download_google_drive(url: str, out_dir: Path) -> None:
             "gdown is not installed. Install it with: pip install gdown"
         )
 
-    parsed = urlparse.urlparse(url)
-    path = parsed.path or ""
-
     print(f"[gdrive] Downloading from Google Drive: {url}")
 
     # Single-file case: use gdown directly
-    if "/folders/" not in path and "/drive/folders/" not in path:
+    if not is_google_drive_folder_url(url):
         try:
             gdown.download(
                 url=url,
                 output=str(out_dir),
                 quiet=False,
                 fuzzy=True,
-                use_cookies=True, 
+                # Single files run on the link pool; with cookies on, gdown
+                # rewrites its cookie jar after every download and parallel
+                # writers would truncate it under each other's load().
+                use_cookies=False,
             )
         except FileURLRetrievalError as e:
             msg = str(e)
             print("[gdrive] FileURLRetrievalError on single file, trying fallback.")
             print(msg.strip())
 
-            browser_url_match = re.search(
-                r"https?://drive\.google\.com/uc\?[^ \n]+", msg
-            )
+            browser_url_match = _BROWSER_URL_RE.search(msg)
             if browser_url_match:
                 from_url = browser_url_match.group(0).strip()
                 try:
@@ -308,28 +608,29 @@ def download_google_drive(url: str, out_dir: Path) -> None:
                 reason = "Could not parse uc?id=... URL from single-file FileURLRetrievalError"
                 print("[gdrive] " + reason)
                 log_failed_google_download(None, None, reason)
+        except Exception as e:
+            reason = f"Unexpected error in gdown.download: {e}"
+            print("[gdrive] " + reason)
+            log_failed_google_download(url, out_dir, reason)
         return
 
-    # Folder case: keep calling gdown until it completes or we hit a hard failure
-    seen_bad_ids: set[str] = set()
-
-    # Folder case: single gdown call with one-shot fallback on error
-    # Folder case: retry a few times on JSONDecodeError; one-shot fallback on FileURLRetrievalError
+    # Folder case: list the folder with gdown (retrying a few times on
+    # JSONDecodeError), then download its files in parallel.
     max_retries = 3
+    files = None
 
     for attempt in range(1, max_retries + 1):
         try:
-            print(f"[gdrive] Folder download attempt {attempt}/{max_retries}")
-            gdown.download_folder(
+            print(f"[gdrive] Folder listing attempt {attempt}/{max_retries}")
+            files = gdown.download_folder(
                 url=url,
                 output=str(out_dir),
                 quiet=False,
                 use_cookies=True,   # <--- was False before
                 remaining_ok=True,
-                resume=True,
+                skip_download=True,
             )
-            print("[gdrive] Folder download completed with gdown.")
-            return  # success, we're done with this folder
+            break
 
         except FolderContentsMaximumLimitError as e:
             print(f"[gdrive] Folder limit error from gdown: {e}")
@@ -337,42 +638,6 @@ def download_google_drive(url: str, out_dir: Path) -> None:
             log_failed_google_download(url, out_dir, f"FolderContentsMaximumLimitError: {e}")
             return  # can't do much more automatically
 
-        except FileURLRetrievalError as e:
-            msg = str(e)
-            print("[gdrive] FileURLRetrievalError encountered during folder download, trying fallback.")
-            print(msg.strip())
-
-            # Try to extract uc?id=... URL from the message
-            browser_url_match = re.search(
-                r"https?://drive\.google\.com/uc\?[^ \n]+", msg
-            )
-            if not browser_url_match:
-                reason = "Could not parse uc?id=... URL from FileURLRetrievalError"
-                print("[gdrive] " + reason)
-                log_failed_google_download(None, None, reason)
-                return
-
-            from_url = browser_url_match.group(0).strip()
-
-            # Try to grab more precise "To:" path if gdown reported it (older-style messages)
-            to_match = re.search(r"To:\s*([^\n]+)", msg)
-            try:
-                if to_match:
-                    to_path = Path(to_match.group(1).strip())
-                    download_file_direct_to_path(from_url, to_path)
-                    print(f"[gdrive] Fallback direct download (explicit path) finished: {to_path}")
-                else:
-                    written_path = download_file_direct_guess_name(from_url, out_dir)
-                    print(f"[gdrive] Fallback direct download (guessed name) finished: {written_path}")
-                # After fallback, we don't re-run gdown for this folder; it will just fail on the same item.
-                print("[gdrive] Stopping after fallback; some later files in this folder may not be downloaded by gdown.")
-            except Exception as inner_e:
-                reason = f"Fallback direct download exception: {inner_e}"
-                print(f"[gdrive] Fallback direct download FAILED: {inner_e}")
-                log_failed_google_download(from_url, None, reason)
-
-            return  # we're done with this folder, successful or not
-
         except json.JSONDecodeError as e:
             # gdown expected JSON from Google but got empty/HTML/etc.
             reason = f"JSONDecodeError in gdown.download_folder: {e}"
@@ -392,28 +657,110 @@ def download_google_drive(url: str, out_dir: Path) -> None:
             log_failed_google_download(url, out_dir, reason)
             return
 
+    if files is None:
+        reason = "gdown.download_folder could not list the folder"
+        print("[gdrive] " + reason)
+        log_failed_google_download(url, out_dir, reason)
+        return
+
+    print(f"[gdrive] Downloading {len(files)} files from folder")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        list(ex.map(download_drive_folder_file, files))
+    print("[gdrive] Folder download completed.")
+
+
+def download_drive_folder_file(entry) -> None:
+    """
+    Download one entry (id, path, local_path) of a gdown folder listing.
+    gdown handles Drive's confirmation pages; if it can't retrieve the file
+    we fall back to a direct GET, and log it if that fails too.
+    """
+    local_path = Path(entry.local_path)
+    if local_path.is_file():
+        print(f"[gdrive] Skipping already downloaded file {local_path}")
+        return
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+
+    from_url = f"https://drive.google.com/uc?id={entry.id}"
+    with _download_slots:
+        try:
+            # No cookies: gdown rewrites its cookie jar after every download,
+            # and parallel writers would clobber it.
+            written = gdown.download(
+                url=from_url,
+                output=str(local_path),
+                quiet=True,
+                use_cookies=False,
+                resume=True,
+            )
+            if written is not None:
+                print(f"[gdrive] -> {local_path}")
+                return
+            print(f"[gdrive] gdown could not download {entry.path}, trying fallback.")
+        except Exception as e:
+            # FileURLRetrievalError, but also connection errors, timeouts and
+            # other gdown internals; none of them may escape the folder pool.
+            print(f"[gdrive] {type(e).__name__} on {entry.path}, trying fallback.")
+            print(str(e).strip())
+
+        try:
+            download_file_direct_to_path(from_url, local_path)
+            print(f"[gdrive] Fallback direct download finished: {local_path}")
+        except Exception as e:
+            reason = f"Fallback direct download exception: {e}"
+            print(f"[gdrive] Fallback direct download FAILED: {e}")
+            log_failed_google_download(from_url, local_path, reason)
+
 
 def find_links_on_page(page_url: str):
     """
     Fetches a page and yields all absolute hrefs found.
     """
-    session = get_session()
+    session = default_session()
     print(f"[page] Fetching {page_url}")
-    r = session.get(page_url, timeout=120)
-    r.raise_for_status()
+    with session.get(page_url, stream=True, timeout=120) as r:
+        r.raise_for_status()
+        # Only pin the encoding when the server declared one.
+        encoding = r.encoding if "charset" in r.headers.get("Content-Type", "").lower() else None
+
+        if etree is not None:
+            # Parse the body as it arrives, so parsing overlaps the download
+            # and links are yielded before the whole page is in.
+            parser = etree.HTMLPullParser(events=("start",), tag="a", encoding=encoding)
+            for chunk in r.iter_content(chunk_size=CHUNK):
+                parser.feed(chunk)
+                yield from _hrefs_from_events(parser, r.url)
+            parser.close()
+            yield from _hrefs_from_events(parser, r.url)
+            return
+
+        if HTMLParser is not None:
+            for a in HTMLParser(r.content).css("a[href]"):
+                href = a.attributes.get("href")
+                if href is not None:  # bare <a href> has no value
+                    yield urlparse.urljoin(r.url, href)
+            return
+
+        # Last resort: lxml isn't importable if we got here.
+        soup = BeautifulSoup(r.content, "html.parser", from_encoding=encoding)
+        for a in soup.find_all("a", href=True):
+            href = a["href"]
+            abs_url = urlparse.urljoin(r.url, href)
+            yield abs_url
 
-    soup = BeautifulSoup(r.text, "html.parser")
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        abs_url = urlparse.urljoin(r.url, href)
-        yield abs_url
 
+def _hrefs_from_events(parser, base_url: str):
+    for _, el in parser.read_events():
+        href = el.get("href")
+        if href is not None:
+            yield urlparse.urljoin(base_url, href)
 
-def looks_like_direct_file(url: str) -> bool:
+
+def looks_like_direct_file(url: str | urlparse.ParseResult) -> bool:
     """
     Heuristic: treat URLs ending with common document extensions as direct files.
     """
-    parsed = urlparse.urlparse(url)
+    parsed = as_parsed(url)
     path = parsed.path.lower()
     exts = (".pdf", ".doc", ".docx", ".xls", ".xlsx", ".csv", ".zip", ".txt")
     return path.endswith(exts)
@@ -421,43 +768,65 @@ def looks_like_direct_file(url: str) -> bool:
 
 # ----------------- Main logic -----------------
 
-def process_url(url: str) -> None:
-    data_dir = ensure_data_dir()
-
-    # If it's a direct Drive or Dropbox link, handle directly
-    if is_google_drive_url(url):
-        download_google_drive(url, data_dir)
-        return
-
-    if is_dropbox_url(url):
-        download_dropbox_file(url, data_dir)
+def dispatch_link(link: str, data_dir: Path) -> None:
+    """
+    Route a scraped link to the matching downloader. Errors are reported
+    and swallowed so one bad link doesn't abort the rest of the page.
+    """
+    parsed = parse_url(link)
+    if is_google_drive_url(parsed) and is_google_drive_folder_url(parsed):
+        # Fans out over its own pool, where each file takes a download slot;
+        # holding one here while waiting on them could deadlock.
+        try:
+            download_google_drive(link, data_dir)
+        except Exception as e:
+            print(f"[gdrive] Failed on {link}: {e}")
         return
 
-    # Otherwise, treat as HTML page and scrape links
-    seen = set()
-    for link in find_links_on_page(url):
-        if link in seen:
-            continue
-        seen.add(link)
-
-        if is_google_drive_url(link):
+    with _download_slots:
+        if is_google_drive_url(parsed):
             try:
                 download_google_drive(link, data_dir)
             except Exception as e:
                 print(f"[gdrive] Failed on {link}: {e}")
-        elif is_dropbox_url(link):
+        elif is_dropbox_url(parsed):
             try:
                 download_dropbox_file(link, data_dir)
             except Exception as e:
                 print(f"[dropbox] Failed on {link}: {e}")
-        elif looks_like_direct_file(link):
+        elif looks_like_direct_file(parsed):
             try:
                 download_generic_file(link, data_dir)
             except Exception as e:
                 print(f"[generic] Failed on {link}: {e}")
-        else:
-            # Not a recognized asset type; ignore.
-            continue
+        # else: not a recognized asset type; ignore.
+
+
+def download_links(links: list[str], data_dir: Path) -> None:
+    """
+    Download all links concurrently. The work is network-bound, so threads
+    release the GIL while waiting on sockets and scale with bandwidth.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        list(ex.map(lambda link: dispatch_link(link, data_dir), links))
+
+
+def process_url(url: str) -> None:
+    data_dir = ensure_data_dir()
+
+    # If it's a direct Drive or Dropbox link, handle directly
+    if is_google_drive_url(url):
+        download_google_drive(url, data_dir)
+        return
+
+    if is_dropbox_url(url):
+        download_dropbox_file(url, data_dir)
+        return
+
+    # Otherwise, treat as HTML page and scrape links (deduped, order preserved).
+    # Fragments never reach the server, so x.pdf#page=3 is the same download.
+    links = list(dict.fromkeys(urlparse.urldefrag(link).url for link in find_links_on_page(url)))
+    download_links(links, data_dir)
 
 
 if __name__ == "__main__":